@@ -0,0 +1,194 @@
+from pathlib import Path
+from datetime import timedelta
+from io import BytesIO
+
+import pandas as pd
+
+from work_hours.core import iter_text_chunks, parse_custom_format, calculate_hours, get_last_week_data
+
+CHAT_PATH = Path(__file__).resolve().parent.parent / "_chat.txt"
+
+
+def baseline_daily_hours(df):
+    # The original per-group loop from app.py, kept as the reference output.
+    df = df.astype({'name': object})
+    df = df[df['message'].str.contains(r'\bin\b|\bout\b|\blunch\b|\bback\b|\breturn\b', na=False)].copy()
+    df['date'] = df['timestamp'].dt.date
+    df['week'] = df['timestamp'].dt.isocalendar().week
+    df['year'] = df['timestamp'].dt.isocalendar().year
+
+    latest_weeks = df[['year', 'week']].drop_duplicates().sort_values(['year', 'week'], ascending=False).head(4)
+    df = df.merge(latest_weeks, on=['year', 'week'])
+
+    records = []
+    for (name, date), group in df.groupby(['name', 'date']):
+        group = group.sort_values(by='timestamp')
+        times = group['timestamp'].tolist()
+        messages = group['message'].tolist()
+        i = 0
+        while i < len(messages) - 1:
+            if any(x in messages[i] for x in ['in', 'back', 'return']) and any(x in messages[i + 1] for x in ['out', 'lunch']):
+                monday = times[i] - timedelta(days=times[i].weekday())
+                sunday = monday + timedelta(days=6)
+                records.append({
+                    'Name': name,
+                    'Date': date.strftime('%b %d, %Y'),
+                    'Day': times[i].strftime('%A'),
+                    'Clock In': times[i].strftime('%I:%M %p'),
+                    'Clock Out': times[i + 1].strftime('%I:%M %p'),
+                    'Hours Worked': round((times[i + 1] - times[i]).total_seconds() / 3600, 2),
+                    'Week': f"{monday.strftime('%b %d')} - {sunday.strftime('%b %d')} {sunday.year}",
+                })
+                i += 2
+            else:
+                i += 1
+    return pd.DataFrame(records)
+
+
+def baseline_last_week(daily_df):
+    # The original get_last_week_data, kept as the reference timesheet.
+    temp_df = daily_df.copy()
+    temp_df['Date_Parsed'] = pd.to_datetime(temp_df['Date'])
+
+    latest_date = temp_df['Date_Parsed'].max().date()
+    week_monday = latest_date - timedelta(days=latest_date.weekday())
+    week_sunday = week_monday + timedelta(days=6)
+
+    last_week_df = temp_df[
+        temp_df['Date_Parsed'].dt.date.between(week_monday, week_sunday)
+    ].copy()
+
+    total_hours = last_week_df.groupby("Name")["Hours Worked"].sum().reset_index()
+    total_hours.rename(columns={"Hours Worked": "Total Hours This Week"}, inplace=True)
+    last_week_df = last_week_df.merge(total_hours, on="Name")
+
+    last_week_df["Name_display"] = last_week_df["Name"].mask(last_week_df["Name"].duplicated(), '')
+    last_week_df["Date_display"] = last_week_df.groupby("Name")["Date"].transform(lambda x: x.mask(x.duplicated(), ''))
+    last_week_df["Day_display"] = last_week_df.groupby("Name")["Day"].transform(lambda x: x.mask(x.duplicated(), ''))
+
+    last_week_df["Total Hours This Week"] = last_week_df.groupby("Name")["Total Hours This Week"].transform(
+        lambda x: [x.iloc[0]] + [''] * (len(x) - 1)
+    )
+
+    last_week_df = last_week_df[
+        ["Name_display", "Date_display", "Day_display", "Clock In", "Clock Out", "Hours Worked", "Total Hours This Week"]
+    ]
+    last_week_df.rename(columns={
+        "Name_display": "Name",
+        "Date_display": "Date",
+        "Day_display": "Day"
+    }, inplace=True)
+
+    return last_week_df, week_monday, week_sunday
+
+
+def assert_matches_baseline(df):
+    daily_df, _, _ = calculate_hours(df)
+    expected = baseline_daily_hours(df)
+    actual = daily_df.astype({'Name': object})
+    assert actual.to_dict('records') == expected.to_dict('records')
+    return actual
+
+
+def test_half_hundredth_duration_rounds_like_python_round():
+    # 2:19:15 PM -> 5:32:45 PM is exactly 3.225 h; np.round gives 3.22.
+    df = parse_custom_format(
+        "[6/7/25, 2:19:15 PM] Mike: in\n"
+        "[6/7/25, 5:32:45 PM] Mike: out\n"
+    )
+    actual = assert_matches_baseline(df)
+    assert actual['Hours Worked'].tolist() == [3.23]
+
+
+def test_back_to_back_runs_pair_like_baseline():
+    # "in, in, out, out" pairs only the middle two; "back/lunch/return/out"
+    # alternates into two pairs; a trailing "in" is left unmatched.
+    df = parse_custom_format(
+        "[6/9/25, 8:00:00 AM] Ana: in\n"
+        "[6/9/25, 8:05:00 AM] Ana: in\n"
+        "[6/9/25, 12:00:18 PM] Ana: out\n"
+        "[6/9/25, 12:01:00 PM] Ana: out\n"
+        "[6/10/25, 9:00:00 AM] Ana: back\n"
+        "[6/10/25, 12:00:00 PM] Ana: lunch\n"
+        "[6/10/25, 12:30:00 PM] Ana: return\n"
+        "[6/10/25, 4:45:18 PM] Ana: out\n"
+        "[6/10/25, 5:00:00 PM] Ana: in\n"
+        "[6/10/25, 9:00:00 AM] Ben: in\n"
+        "[6/10/25, 1:12:18 PM] Ben: out\n"
+    )
+    actual = assert_matches_baseline(df)
+    assert len(actual) == 4
+
+
+def test_bundled_chat_matches_baseline():
+    df = parse_custom_format(CHAT_PATH.read_text(encoding="utf-8"))
+    assert_matches_baseline(df)
+
+
+def test_non_newline_line_breaks_split_messages_like_splitlines():
+    # The original parser split lines with str.splitlines(), so CR-only and
+    # Unicode separators end a message just like "\n" does.
+    for sep in ["\r", "\u2028", "\x85"]:
+        df = parse_custom_format(
+            f"[6/9/25, 8:00 AM] Ana: in{sep}[6/9/25, 12:00 PM] Ana: out{sep}"
+        )
+        assert df['message'].tolist() == ['in', 'out']
+        actual = assert_matches_baseline(df)
+        assert len(actual) == 1
+
+
+def test_chunked_decoding_matches_whole_text():
+    # A 3-byte chunk size splits lines mid-message and the emoji's 4-byte
+    # UTF-8 sequence across reads; the CR-only copy has no "\n" at all.
+    text = (
+        "[6/9/25, 8:00 AM] Ana 🌞: in\r\n"
+        "[6/9/25, 12:00 PM] Ana 🌞: out\r\n"
+        "[6/9/25, 9:15 AM] Zoë: back\r\n"
+        "[6/9/25, 1:45 PM] Zoë: lunch 🍕\r\n"
+    )
+    for chat in [text, text.replace("\r\n", "\r")]:
+        chunks = list(iter_text_chunks(BytesIO(chat.encode("utf-8")), chunk_size=3))
+        assert "".join(chunks) == chat
+        assert len(chunks) >= 4
+        expected = parse_custom_format(chat)
+        actual = parse_custom_format(chunks)
+        assert actual.to_dict('records') == expected.to_dict('records')
+        assert len(actual) == 4
+
+
+def assert_last_week_matches_baseline(df):
+    daily_df, _, days = calculate_hours(df)
+    expected_df, expected_monday, expected_sunday = baseline_last_week(baseline_daily_hours(df))
+    last_week_df, week_monday, week_sunday = get_last_week_data(daily_df, days)
+    assert (week_monday, week_sunday) == (expected_monday, expected_sunday)
+    assert list(last_week_df.columns) == list(expected_df.columns)
+    assert last_week_df.to_dict('records') == expected_df.to_dict('records')
+    return last_week_df
+
+
+def test_last_week_timesheet_matches_baseline():
+    # Two people over two days of the latest week, with two shifts on one
+    # day; the earlier week's shift must be left out of the timesheet.
+    df = parse_custom_format(
+        "[6/3/25, 9:00 AM] Ana: in\n"
+        "[6/3/25, 5:00 PM] Ana: out\n"
+        "[6/9/25, 8:00 AM] Ana: in\n"
+        "[6/9/25, 12:00 PM] Ana: lunch\n"
+        "[6/9/25, 12:30 PM] Ana: back\n"
+        "[6/9/25, 4:45 PM] Ana: out\n"
+        "[6/10/25, 9:00 AM] Ana: in\n"
+        "[6/10/25, 1:15 PM] Ana: out\n"
+        "[6/9/25, 10:00 AM] Ben: in\n"
+        "[6/9/25, 2:00 PM] Ben: out\n"
+        "[6/10/25, 8:30 AM] Ben: in\n"
+        "[6/10/25, 5:10 PM] Ben: out\n"
+    )
+    actual = assert_last_week_matches_baseline(df)
+    assert actual['Name'].tolist() == ['Ana', '', '', 'Ben', '']
+    assert actual['Date'].tolist() == ['Jun 09, 2025', '', 'Jun 10, 2025', 'Jun 09, 2025', 'Jun 10, 2025']
+    assert actual['Total Hours This Week'].tolist() == [12.5, '', '', 12.67, '']
+
+
+def test_bundled_chat_last_week_matches_baseline():
+    df = parse_custom_format(CHAT_PATH.read_text(encoding="utf-8"))
+    assert_last_week_matches_baseline(df)
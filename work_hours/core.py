@@ -0,0 +1,183 @@
+import pandas as pd
+import numpy as np
+import re
+import codecs
+from datetime import date, timedelta
+from functools import lru_cache
+from io import BytesIO
+
+# Every separator str.splitlines() breaks on, not just "\n", so a chat saved
+# with CR-only or Unicode line endings still parses one message per line.
+LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+LINE_PATTERN = re.compile(
+    rf"(?:^|(?<=[{LINE_BREAKS}]))"
+    r"\[(\d{1,2}/\d{1,2}/\d{2,4}), (\d{1,2}:\d{2}(?::\d{2})?"
+    rf"[^\S{LINE_BREAKS}]?[APMapm]{{2}})\] ([^{LINE_BREAKS}]*?): ([^{LINE_BREAKS}]+)"
+)
+KEYWORD_PATTERN = re.compile(r'\b(?:in|out|lunch|back|return)\b')
+CLOCK_IN_PATTERN = re.compile(r'in|back|return')
+CLOCK_OUT_PATTERN = re.compile(r'out|lunch')
+
+def iter_text_chunks(binary_file, chunk_size=64 * 1024):
+    # Decode the upload a block at a time, only ever yielding whole lines so
+    # LINE_PATTERN never sees a message split across two chunks. Cutting on
+    # any LINE_BREAKS character keeps CR-only chats from piling up in tail.
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    tail = ""
+    while chunk := binary_file.read(chunk_size):
+        text = tail + decoder.decode(chunk)
+        cut = max(map(text.rfind, LINE_BREAKS)) + 1
+        if cut:
+            yield text[:cut]
+        tail = text[cut:]
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+def parse_custom_format(file_text):
+    chunks = [file_text] if isinstance(file_text, str) else file_text
+    rows = [match.groups() for chunk in chunks for match in LINE_PATTERN.finditer(chunk)]
+    if not rows:
+        return pd.DataFrame()
+
+    date_strs, time_strs, names, messages = zip(*rows)
+    timestamp_strs = pd.Series([f"{d} {t.strip()}" for d, t in zip(date_strs, time_strs)])
+    timestamps = pd.to_datetime(timestamp_strs, format="%m/%d/%y %I:%M %p", errors='coerce', cache=True)
+    missing = timestamps.isna()
+    if missing.any():
+        timestamps[missing] = pd.to_datetime(
+            timestamp_strs[missing], format="%m/%d/%y %I:%M:%S %p", errors='coerce', cache=True
+        )
+
+    df = pd.DataFrame({
+        "name": pd.Series(names).str.strip().astype("category"),
+        "timestamp": timestamps,
+        "message": pd.Series(messages).str.strip().str.lower()
+    })
+    return df[df['timestamp'].notna()].reset_index(drop=True)
+
+# Proleptic Gregorian ordinal of 1970-01-01, for converting datetime64[D] values.
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+@lru_cache(maxsize=None)
+def week_label(monday_ordinal):
+    monday = date.fromordinal(monday_ordinal)
+    sunday = monday + timedelta(days=6)
+    return f"{monday.strftime('%b %d')} - {sunday.strftime('%b %d')} {sunday.year}"
+
+def calculate_hours(df):
+    # Clock messages repeat constantly ("out", "<name> lunch"), so run the
+    # regexes once per distinct message and broadcast the flags by code.
+    message_codes, unique_messages = pd.factorize(df['message'], use_na_sentinel=False)
+    unique_messages = pd.Series(unique_messages)
+    is_keyword = unique_messages.str.contains(KEYWORD_PATTERN, na=False).to_numpy(dtype=bool)
+    is_in = unique_messages.str.contains(CLOCK_IN_PATTERN, na=False).to_numpy(dtype=bool)
+    is_out = unique_messages.str.contains(CLOCK_OUT_PATTERN, na=False).to_numpy(dtype=bool)
+
+    # Fold the keyword and latest-four-weeks filters into one set of row
+    # positions so the frame is only materialized once, by the sort below.
+    rows = np.flatnonzero(is_keyword[message_codes])
+    iso = df['timestamp'].take(rows).dt.isocalendar()
+    year_week = (iso['year'] * 100 + iso['week']).to_numpy(dtype=np.int64)
+
+    latest_weeks = np.unique(year_week)[-4:]
+    rows = rows[np.isin(year_week, latest_weeks)]
+
+    # 'date' is derived from 'timestamp', so this is already (name, date, timestamp) order.
+    df = (
+        df.take(rows)
+        .assign(message_code=message_codes[rows])
+        .sort_values(['name', 'timestamp'], kind='stable', ignore_index=True)
+    )
+    df['date'] = df['timestamp'].dt.normalize()
+    df['is_in'] = is_in[df['message_code'].to_numpy()]
+    df['is_out'] = is_out[df['message_code'].to_numpy()]
+
+    next_msg = df.groupby(['name', 'date'], sort=False, observed=True)[['is_out', 'timestamp']].shift(-1)
+    next_ts = next_msg['timestamp']
+    candidate = (df['is_in'] & next_msg['is_out'].eq(True)).to_numpy(dtype=bool)
+
+    # A matched pair consumes both messages, so inside a run of back-to-back
+    # candidates only every other one (starting with the first) is a real pair.
+    run_id = np.cumsum(~candidate)
+    run_pos = pd.Series(candidate).groupby(run_id).cumsum().to_numpy()
+    pair_mask = candidate & (run_pos % 2 == 1)
+
+    # Build each output column straight from the masked arrays; there is no
+    # per-pair record and no index to align or reset.
+    clock_in = pd.DatetimeIndex(df['timestamp'].to_numpy()[pair_mask])
+    clock_out = pd.DatetimeIndex(next_ts.to_numpy()[pair_mask])
+    days = clock_in.to_numpy().astype('datetime64[D]')
+    mondays = days - clock_in.weekday.to_numpy().astype('timedelta64[D]')
+    week_starts, week_idx = np.unique(mondays, return_inverse=True)
+    week_labels = pd.Index(week_starts.astype(np.int64) + EPOCH_ORDINAL).map(week_label)
+    # Round each pair with Python's round() on plain floats, as the original
+    # loop did; np.round scales by 100 first and can land 0.01 h low or high
+    # on half-hundredth durations.
+    seconds = (clock_out - clock_in).total_seconds().tolist()
+    hours = np.array([round(s / 3600, 2) for s in seconds], dtype=float)
+    daily_df = pd.DataFrame({
+        'Name': df['name'].array[pair_mask],
+        'Date': clock_in.strftime('%b %d, %Y'),
+        'Day': clock_in.strftime('%A'),
+        'Clock In': clock_in.strftime('%I:%M %p'),
+        'Clock Out': clock_out.strftime('%I:%M %p'),
+        'Hours Worked': hours,
+        'Week': week_labels[week_idx],
+    })
+
+    if not daily_df.empty:
+        weekly_summary = (
+            daily_df.groupby(['Name', 'Week'], observed=True)['Hours Worked']
+            .sum().reset_index()
+            .rename(columns={'Hours Worked': 'Total Hours'})
+        )
+    else:
+        weekly_summary = pd.DataFrame()
+
+    # The datetime64 day of each row is returned alongside the log rather than
+    # as a column, so get_last_week_data never parses the 'Date' strings back.
+    return daily_df, weekly_summary, days
+
+def get_last_week_data(daily_df, days):
+    if daily_df.empty:
+        return pd.DataFrame(), None, None
+
+    latest_date = pd.Timestamp(days.max()).date()
+    week_monday = latest_date - timedelta(days=latest_date.weekday())
+    week_sunday = week_monday + timedelta(days=6)
+
+    in_week = (days >= np.datetime64(week_monday)) & (days <= np.datetime64(week_sunday))
+    last_week_df = daily_df[in_week]
+
+    if not last_week_df.empty:
+        # Only the first row per person shows their name and weekly total, and
+        # only the first row per day shows the date, so the sheet reads as groups.
+        repeated_name = last_week_df.duplicated("Name")
+        total_hours = last_week_df.groupby("Name", observed=True)["Hours Worked"].transform("sum")
+        last_week_df = pd.DataFrame({
+            "Name": last_week_df["Name"].astype(object).mask(repeated_name, ''),
+            "Date": last_week_df["Date"].mask(last_week_df.duplicated(["Name", "Date"]), ''),
+            "Day": last_week_df["Day"].mask(last_week_df.duplicated(["Name", "Day"]), ''),
+            "Clock In": last_week_df["Clock In"],
+            "Clock Out": last_week_df["Clock Out"],
+            "Hours Worked": last_week_df["Hours Worked"],
+            "Total Hours This Week": total_hours.mask(repeated_name, ''),
+        }).reset_index(drop=True)
+
+    return last_week_df, week_monday, week_sunday
+
+# Build the workbook in memory rather than through per-sheet temp files, and
+# skip the per-cell URL detection since none of the exported columns hold links.
+EXCEL_OPTIONS = {'options': {'in_memory': True, 'strings_to_urls': False}}
+
+def to_excel_bytes_with_title(df, title):
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter', engine_kwargs=EXCEL_OPTIONS) as writer:
+        df.to_excel(writer, sheet_name='Sheet1', startrow=1, index=False)
+        workbook = writer.book
+        worksheet = writer.sheets['Sheet1']
+        header_format = workbook.add_format({'bold': True, 'align': 'center', 'valign': 'vcenter', 'font_size': 14})
+        worksheet.merge_range(0, 0, 0, len(df.columns)-1, title, header_format)
+    output.seek(0)
+    return output.getvalue()